@@ -27,6 +27,7 @@ class FlightAdmin(admin.ModelAdmin):
         "excluded",
     )
     list_editable = ("excluded",)
+    list_select_related = ("pilot", "plane", "route")
     search_fields = (
         "date",
         "plane__tail_number",
@@ -39,6 +40,11 @@ class FlightAdmin(admin.ModelAdmin):
         "notes",
     )
 
+    def get_queryset(self, request):
+        # Route.__str__ lists its waypoints, so load them with the page
+        qs = super().get_queryset(request)
+        return qs.prefetch_related("route__route_steps__waypoint")
+
 
 class GroundAdmin(admin.ModelAdmin):
     list_display = (
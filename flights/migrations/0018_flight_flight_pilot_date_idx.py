@@ -0,0 +1,20 @@
+# Generated by Django 6.0 on 2026-10-15 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('flights', '0017_flight_holds_approach'),
+        ('pilots', '0006_remove_pilot_medical_certificate'),
+        ('planes', '0002_rename_sim_type_simulator_sim_class_and_more'),
+        ('routes', '0003_airport_country'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='flight',
+            index=models.Index(fields=['pilot', '-date'], name='flight_pilot_date_idx'),
+        ),
+    ]
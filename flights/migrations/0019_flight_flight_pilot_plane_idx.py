@@ -0,0 +1,20 @@
+# Generated by Django 6.0 on 2026-10-15 10:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('flights', '0018_flight_flight_pilot_date_idx'),
+        ('pilots', '0006_remove_pilot_medical_certificate'),
+        ('planes', '0002_rename_sim_type_simulator_sim_class_and_more'),
+        ('routes', '0003_airport_country'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='flight',
+            index=models.Index(fields=['pilot', 'plane'], name='flight_pilot_plane_idx'),
+        ),
+    ]
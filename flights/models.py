@@ -40,6 +40,12 @@ class Flight(models.Model):
     duration = models.DurationField(null=True, blank=True)
     excluded = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["pilot", "-date"], name="flight_pilot_date_idx"),
+            models.Index(fields=["pilot", "plane"], name="flight_pilot_plane_idx"),
+        ]
+
     def __str__(self):
         return f"{self.date}: {self.plane} {self.flight_time} {self.route}"
 
@@ -1,56 +1,68 @@
-from datetime import datetime, timedelta
+from bisect import bisect_right
+from datetime import date, timedelta
 
 from django.db import models
-from django.db.models import Sum
+from django.db.models import F, Sum, Window
 
 from flights.models import Flight
 
 
+# Days remaining at which an expiry moves into the next status, and the statuses in between
+EXPIRY_STATUS_THRESHOLDS = (0, 30, 60)
+EXPIRY_STATUSES = ('expired', 'critical', 'warning', 'current')
+
+
+def expiry_status(days_remaining):
+    """
+    Map days until expiry to a status: 'expired' below 0, 'critical' under 30,
+    'warning' under 60 and 'current' otherwise.
+    """
+    return EXPIRY_STATUSES[bisect_right(EXPIRY_STATUS_THRESHOLDS, days_remaining)]
+
+
+def _third_landing_date(flights, landings):
+    """Date of the flight holding the 3rd most recent landing, or None if there are fewer than 3."""
+    return flights.annotate(
+        landings_since=Window(Sum(landings), order_by=F('date').desc())
+    ).filter(landings_since__gte=3).order_by('-date').values_list('date', flat=True).first()
+
+
 def check_passenger_currency(pilot):
     """
     Check passenger carrying currency per FAR 61.57(a).
     Requires 3 takeoffs and landings in the preceding 90 days.
     """
-    ninety_days_ago = datetime.now().date() - timedelta(days=90)
-    recent_flights = Flight.objects.filter(pilot=pilot, date__gte=ninety_days_ago, excluded=False)
+    ninety_days_ago = date.today() - timedelta(days=90)
+    recent_totals = Flight.objects.filter(pilot=pilot, date__gte=ninety_days_ago, excluded=False).aggregate(
+        day_landings=Sum('day_landings'),
+        day_fullstop_landings=Sum('day_fullstop_landings'),
+        night_fullstop_landings=Sum('night_fullstop_landings'),
+    )
 
-    day_landings_sum = recent_flights.aggregate(Sum('day_landings'))['day_landings__sum'] or 0
-    day_fullstop_sum = recent_flights.aggregate(Sum('day_fullstop_landings'))['day_fullstop_landings__sum'] or 0
-    day_landings = day_landings_sum + day_fullstop_sum
-    night_fullstop_landings = recent_flights.aggregate(Sum('night_fullstop_landings'))['night_fullstop_landings__sum'] or 0
+    day_landings = (recent_totals['day_landings'] or 0) + (recent_totals['day_fullstop_landings'] or 0)
+    night_fullstop_landings = recent_totals['night_fullstop_landings'] or 0
 
     # Find the date when currency expires (90 days from the 3rd landing)
     day_expiry = None
     night_expiry = None
 
     # Calculate day currency expiration
-    day_landing_flights = Flight.objects.filter(
-        pilot=pilot,
-        excluded=False,
-    ).filter(
-        models.Q(day_landings__gt=0) | models.Q(day_fullstop_landings__gt=0)
-    ).order_by('-date')
-
-    day_count = 0
-    for flight in day_landing_flights:
-        day_count += flight.day_landings + flight.day_fullstop_landings
-        if day_count >= 3:
-            day_expiry = flight.date + timedelta(days=90)
-            break
+    day_third_landing = _third_landing_date(
+        Flight.objects.filter(pilot=pilot, excluded=False).filter(
+            models.Q(day_landings__gt=0) | models.Q(day_fullstop_landings__gt=0)
+        ),
+        F('day_landings') + F('day_fullstop_landings'),
+    )
+    if day_third_landing:
+        day_expiry = day_third_landing + timedelta(days=90)
 
     # Calculate night currency expiration
-    night_landing_flights = Flight.objects.filter(
-        pilot=pilot,
-        night_fullstop_landings__gt=0,
-        excluded=False,
-    ).order_by('-date')
-
-    night_count = 0
-    for flight in night_landing_flights:
-        night_count += flight.night_fullstop_landings
-        if night_count >= 3:
-            night_expiry = flight.date + timedelta(days=90)
-            break
+    night_third_landing = _third_landing_date(
+        Flight.objects.filter(pilot=pilot, night_fullstop_landings__gt=0, excluded=False),
+        F('night_fullstop_landings'),
+    )
+    if night_third_landing:
+        night_expiry = night_third_landing + timedelta(days=90)
 
     return {
         'day_current': day_landings >= 3,
@@ -86,26 +98,20 @@ def check_medical_status(pilot):
                 'status': 'none'
             }
 
-        current_privilege = latest_medical.get_current_privilege_level()
-        next_expiry = latest_medical.get_next_expiration_date()
+        # One "today" for both the privilege check and the countdown
+        today = date.today()
+        current_privilege, next_expiry = latest_medical.get_current_privileges(today)
 
         if next_expiry:
-            days_remaining = (next_expiry - datetime.now().date()).days
+            days_remaining = (next_expiry - today).days
         else:
             days_remaining = None
 
         # Determine status color coding
-        if current_privilege is None:
+        if current_privilege is None or days_remaining is None:
             status = 'expired'
-        elif days_remaining is not None:
-            if days_remaining < 30:
-                status = 'critical'
-            elif days_remaining < 60:
-                status = 'warning'
-            else:
-                status = 'current'
         else:
-            status = 'expired'
+            status = expiry_status(days_remaining)
 
         return {
             'has_medical': True,
@@ -158,25 +164,20 @@ def check_license_status(pilot):
                 'status': 'none'
             }
 
+        today = date.today()
+
         # If expiration is explicitly set in the database, use it
         if latest_license.expiration:
             expiry_date = latest_license.expiration
         else:
             # Calculate expiration as 24 months from today (placeholder)
             # Note: You may need to add an 'issued_date' field to track actual issuance
-            expiry_date = datetime.now().date() + relativedelta(months=24)
+            expiry_date = today + relativedelta(months=24)
 
-        days_remaining = (expiry_date - datetime.now().date()).days
+        days_remaining = (expiry_date - today).days
 
         # Determine status color coding
-        if days_remaining < 0:
-            status = 'expired'
-        elif days_remaining < 30:
-            status = 'critical'
-        elif days_remaining < 60:
-            status = 'warning'
-        else:
-            status = 'current'
+        status = expiry_status(days_remaining)
 
         return {
             'has_license': True,
@@ -208,16 +209,17 @@ def days_until_currency_expires(pilot, currency_type='day'):
         Number of days until expiry, or None if not current
     """
     currency = check_passenger_currency(pilot)
+    today = date.today()
 
     if currency_type == 'day':
         if not currency['day_current']:
             return None
         if currency['day_expiry']:
-            return (currency['day_expiry'] - datetime.now().date()).days
+            return (currency['day_expiry'] - today).days
     elif currency_type == 'night':
         if not currency['night_current']:
             return None
         if currency['night_expiry']:
-            return (currency['night_expiry'] - datetime.now().date()).days
+            return (currency['night_expiry'] - today).days
 
     return None
@@ -1,34 +1,63 @@
-from datetime import datetime, timedelta
+from collections import defaultdict
+from datetime import date, timedelta
+from itertools import groupby
+from operator import itemgetter
 
-from django.db.models import Count, Q, Sum
-from django.db.models.functions import TruncMonth
+from django.db.models import Count, F, FloatField, Max, OuterRef, Prefetch, Q, RowRange, Subquery, Sum, Window
+from django.db.models.functions import Cast, TruncMonth
+from django.utils.functional import cached_property
 
 from flights.models import Approach, Flight, Ground, SimulatorFlight
+from flights.utils.currency_calculator import check_passenger_currency
+
+
+def _month_starts(months):
+    """First day of each of the last N months, oldest first and ending with the current month."""
+    today = date.today()
+    current = today.year * 12 + today.month - 1
+    return [date(index // 12, index % 12 + 1, 1) for index in range(current - months + 1, current + 1)]
 
 
 def get_total_times(pilot):
     """Aggregate all flight time categories for a pilot."""
-    flights = Flight.objects.filter(pilot=pilot, excluded=False)
+    # Aliases end in _sum so none of them shadow a Flight field in the xc_pic filter
+    totals = Flight.objects.filter(pilot=pilot, excluded=False).aggregate(
+        total_sum=Sum('flight_time'),
+        pic_sum=Sum('pic_time'),
+        sic_sum=Sum('sic_time'),
+        dual_sum=Sum('flight_training_received'),
+        xc_sum=Sum('xc_time'),
+        xc_pic_sum=Sum('xc_time', filter=Q(xc_time__gt=0, pic_time__gt=0)),
+        day_sum=Sum('day_time'),
+        night_sum=Sum('night_time'),
+        actual_instrument_sum=Sum('actual_instrument_time'),
+        simulated_instrument_sum=Sum('simulated_instrument_time'),
+        day_landings_sum=Sum('day_landings'),
+        day_fullstop_landings_sum=Sum('day_fullstop_landings'),
+        night_landings_sum=Sum('night_landings'),
+        night_fullstop_landings_sum=Sum('night_fullstop_landings'),
+    )
 
     total_landings = (
-        (flights.aggregate(Sum('day_landings'))['day_landings__sum'] or 0) +
-        (flights.aggregate(Sum('day_fullstop_landings'))['day_fullstop_landings__sum'] or 0) +
-        (flights.aggregate(Sum('night_landings'))['night_landings__sum'] or 0) +
-        (flights.aggregate(Sum('night_fullstop_landings'))['night_fullstop_landings__sum'] or 0)
+        (totals['day_landings_sum'] or 0) +
+        (totals['day_fullstop_landings_sum'] or 0) +
+        (totals['night_landings_sum'] or 0) +
+        (totals['night_fullstop_landings_sum'] or 0)
     )
 
     return {
-        'total_time': round(float(flights.aggregate(Sum('flight_time'))['flight_time__sum'] or 0), 1),
-        'pic_time': round(float(flights.aggregate(Sum('pic_time'))['pic_time__sum'] or 0), 1),
-        'sic_time': round(float(flights.aggregate(Sum('sic_time'))['sic_time__sum'] or 0), 1),
-        'dual_time': round(float(flights.aggregate(Sum('flight_training_received'))['flight_training_received__sum'] or 0), 1),
-        'xc_time': round(float(flights.aggregate(Sum('xc_time'))['xc_time__sum'] or 0), 1),
-        'day_time': round(float(flights.aggregate(Sum('day_time'))['day_time__sum'] or 0), 1),
-        'night_time': round(float(flights.aggregate(Sum('night_time'))['night_time__sum'] or 0), 1),
-        'actual_instrument': round(float(flights.aggregate(Sum('actual_instrument_time'))['actual_instrument_time__sum'] or 0), 1),
-        'simulated_instrument': round(float(flights.aggregate(Sum('simulated_instrument_time'))['simulated_instrument_time__sum'] or 0), 1),
-        'day_landings': flights.aggregate(Sum('day_landings'))['day_landings__sum'] or 0,
-        'night_landings': flights.aggregate(Sum('night_landings'))['night_landings__sum'] or 0,
+        'total_time': round(float(totals['total_sum'] or 0), 1),
+        'pic_time': round(float(totals['pic_sum'] or 0), 1),
+        'sic_time': round(float(totals['sic_sum'] or 0), 1),
+        'dual_time': round(float(totals['dual_sum'] or 0), 1),
+        'xc_time': round(float(totals['xc_sum'] or 0), 1),
+        'xc_pic_time': round(float(totals['xc_pic_sum'] or 0), 1),
+        'day_time': round(float(totals['day_sum'] or 0), 1),
+        'night_time': round(float(totals['night_sum'] or 0), 1),
+        'actual_instrument': round(float(totals['actual_instrument_sum'] or 0), 1),
+        'simulated_instrument': round(float(totals['simulated_instrument_sum'] or 0), 1),
+        'day_landings': totals['day_landings_sum'] or 0,
+        'night_landings': totals['night_landings_sum'] or 0,
         'total_landings': total_landings,
     }
 
@@ -40,140 +69,136 @@ def get_total_approaches(pilot):
 
 def get_monthly_breakdown(pilot, months=12):
     """Get flight hours broken down by month for the last N months, including months with 0 hours."""
-    from dateutil.relativedelta import relativedelta
-
-    # Get current date and calculate start date
-    now = datetime.now().date()
-    start_date = now - relativedelta(months=months-1)
-    start_date = start_date.replace(day=1)  # Start from first day of the month
-
-    # Query flights and group by month
-    monthly = Flight.objects.filter(
-        pilot=pilot,
-        date__gte=start_date,
-        excluded=False,
-    ).annotate(
-        month=TruncMonth('date')
-    ).values('month').annotate(
-        hours=Sum('flight_time')
-    ).order_by('month')
-
-    # Create a dictionary of month -> hours from database results
-    hours_by_month = {
-        entry['month']: float(entry['hours']) if entry['hours'] else 0
-        for entry in monthly
-    }
-
-    # Generate all months in the range and fill in 0 for missing months
-    result = []
-    current = start_date
-    for _ in range(months):
-        month_key = datetime(current.year, current.month, 1).date()
-        result.append({
-            'month': current.strftime('%b %Y'),
-            'hours': hours_by_month.get(month_key, 0)
-        })
-        current = current + relativedelta(months=1)
+    # First day of each month in the range, oldest first
+    month_starts = _month_starts(months)
+    start_date = month_starts[0]
+
+    # Query flights and group by month into a dictionary of month -> hours
+    hours_by_month = dict(
+        Flight.objects.filter(
+            pilot=pilot,
+            date__gte=start_date,
+            excluded=False,
+        ).annotate(
+            month=TruncMonth('date')
+        ).values_list('month').annotate(
+            hours=Cast(Sum('flight_time'), FloatField())
+        ).order_by()
+    )
 
-    return result
+    # Fill in 0 for months without flights
+    return [
+        {
+            'month': month_start.strftime('%b %Y'),
+            'hours': hours_by_month.get(month_start, 0)
+        }
+        for month_start in month_starts
+    ]
 
 
 def get_instrument_breakdown(pilot):
     """Get breakdown of instrument time (actual vs simulated from flights and simulators)."""
-    flights = Flight.objects.filter(pilot=pilot, excluded=False)
-    simulator_flights = SimulatorFlight.objects.filter(pilot=pilot)
+    return _instrument_breakdown(pilot, get_total_times(pilot))
+
 
-    actual = flights.aggregate(Sum('actual_instrument_time'))['actual_instrument_time__sum'] or 0
-    flight_simulated = flights.aggregate(Sum('simulated_instrument_time'))['simulated_instrument_time__sum'] or 0
-    simulator_simulated = simulator_flights.aggregate(Sum('simulated_instrument_time'))['simulated_instrument_time__sum'] or 0
+def _instrument_breakdown(pilot, total_times):
+    """Instrument breakdown using the flight instrument sums from get_total_times."""
+    actual = total_times['actual_instrument']
+    flight_simulated = total_times['simulated_instrument']
+
+    simulator_totals = SimulatorFlight.objects.filter(pilot=pilot).aggregate(
+        simulated=Sum('simulated_instrument_time'),
+    )
+    simulator_simulated = float(simulator_totals['simulated'] or 0)
 
     total_simulated = flight_simulated + simulator_simulated
 
     return {
-        'actual': round(float(actual), 1),
-        'flight_simulated': round(float(flight_simulated), 1),
-        'simulator_simulated': round(float(simulator_simulated), 1),
-        'simulated': round(float(total_simulated), 1),
-        'total': round(float(actual + total_simulated), 1)
+        'actual': round(actual, 1),
+        'flight_simulated': round(flight_simulated, 1),
+        'simulator_simulated': round(simulator_simulated, 1),
+        'simulated': round(total_simulated, 1),
+        'total': round(actual + total_simulated, 1)
     }
 
 
-def get_aircraft_breakdown(pilot):
-    """Get flight hours broken down by aircraft with type and location information."""
-    flights = Flight.objects.filter(pilot=pilot, excluded=False).select_related('plane', 'route').prefetch_related('route__route_steps__waypoint').order_by('plane', '-date')
+def _plane_hours(pilot):
+    """Flight hours per plane with tail number and type, most flown first."""
+    return Flight.objects.filter(pilot=pilot, excluded=False).values('plane').annotate(
+        tail_number=F('plane__tail_number'),
+        type=F('plane__type'),
+        hours=Sum('flight_time'),
+    ).order_by('-hours', 'plane')
 
-    aircraft_data = {}
-    for flight in flights:
-        plane_name = str(flight.plane)
-        if plane_name not in aircraft_data:
-            # Get first waypoint from route for location
-            location = None
-            if flight.route:
-                first_waypoint = flight.route.route_steps.order_by('sequence').first()
-                if first_waypoint:
-                    location = first_waypoint.waypoint.code
-
-            aircraft_data[plane_name] = {
-                'tail_number': plane_name,
-                'type': flight.plane.type,
-                'hours': 0,
-                'location': location  # Location from most recent flight (since ordered by -date)
-            }
-        aircraft_data[plane_name]['hours'] += float(flight.flight_time)
 
-    # Sort by hours (descending) and return as list of tuples with dict values
-    return sorted(aircraft_data.values(), key=lambda x: x['hours'], reverse=True)
+def get_aircraft_breakdown(pilot):
+    """Get flight hours broken down by aircraft with type and location information."""
+    from routes.models import RouteWaypoint
 
+    flights = Flight.objects.filter(pilot=pilot, excluded=False)
 
-def get_recent_flights(pilot, limit=10):
-    """Get the most recent N flights for a pilot with computed total landings."""
-    flights = Flight.objects.filter(pilot=pilot, excluded=False).select_related('plane').order_by('-date')[:limit]
+    # Location is the first waypoint of the route flown on the plane's most recent flight
+    latest_route = flights.filter(plane=OuterRef(OuterRef('plane'))).order_by('-date', '-id').values('route')[:1]
+    location = RouteWaypoint.objects.filter(route=Subquery(latest_route)).order_by('sequence').values('waypoint__code')[:1]
 
-    # Add computed total landings to each flight
-    flights_with_totals = []
-    for flight in flights:
-        flight.total_day_landings = flight.day_landings + flight.day_fullstop_landings
-        flight.total_night_landings = flight.night_landings + flight.night_fullstop_landings
-        flights_with_totals.append(flight)
+    aircraft = _plane_hours(pilot).annotate(location=Subquery(location))
 
-    return flights_with_totals
+    return [
+        {
+            'tail_number': entry['tail_number'],
+            'type': entry['type'],
+            'hours': float(entry['hours']),
+            'location': entry['location'],
+        }
+        for entry in aircraft
+    ]
 
 
-def get_last_flight_date(pilot):
-    """Get the date of the pilot's last flight."""
-    last_flight = Flight.objects.filter(pilot=pilot, excluded=False).order_by('-date').first()
+def get_recent_flights(pilot, limit=10):
+    """Get the most recent N flights for a pilot with computed total landings."""
+    return Flight.objects.filter(pilot=pilot, excluded=False).order_by('-date').values(
+        'date',
+        'plane__tail_number',
+        'flight_time',
+        'notes',
+        total_day_landings=F('day_landings') + F('day_fullstop_landings'),
+        total_night_landings=F('night_landings') + F('night_fullstop_landings'),
+    )[:limit]
 
-    if not last_flight:
-        return None
 
-    return last_flight.date
+def get_days_since_last_flight(pilot):
+    """Get the number of days since the pilot's last flight, or None if there are no flights."""
+    last_date = Flight.objects.filter(pilot=pilot, excluded=False).aggregate(last_date=Max('date'))['last_date']
+    return (date.today() - last_date).days if last_date else None
 
 
 def get_cumulative_time_data(pilot):
     """Get cumulative time data for line chart (all flights chronologically)."""
-    flights = Flight.objects.filter(pilot=pilot, excluded=False).order_by('date')
-
-    cumulative_data = []
-    total = 0
-    pic = 0
-    dual = 0
-    instrument = 0
+    def running_total(expression):
+        # Sum of every flight up to and including this one, cast so rows arrive as floats
+        return Cast(
+            Window(Sum(expression), order_by=[F('date').asc(), F('id').asc()], frame=RowRange(start=None, end=0)),
+            FloatField(),
+        )
 
-    for flight in flights:
-        total += float(flight.flight_time)
-        pic += float(flight.pic_time)
-        dual += float(flight.flight_training_received)
-        instrument += float(flight.actual_instrument_time + flight.simulated_instrument_time)
+    flights = Flight.objects.filter(pilot=pilot, excluded=False).order_by('date', 'id').values_list(
+        'date',
+        running_total('flight_time'),
+        running_total('pic_time'),
+        running_total('flight_training_received'),
+        running_total(F('actual_instrument_time') + F('simulated_instrument_time')),
+    )
 
-        cumulative_data.append({
-            'date': flight.date.strftime('%Y-%m-%d'),
+    return [
+        {
+            'date': flight_date.isoformat(),
             'total': round(total, 1),
             'pic': round(pic, 1),
             'dual': round(dual, 1),
             'instrument': round(instrument, 1)
-        })
-
-    return cumulative_data
+        }
+        for flight_date, total, pic, dual, instrument in flights.iterator(chunk_size=2000)
+    ]
 
 
 def get_xc_pic_time(pilot):
@@ -183,46 +208,43 @@ def get_xc_pic_time(pilot):
     return round(float(xc_pic_total), 1)
 
 
+def _requirement_progress(current, required):
+    """Progress of a current total toward a required minimum, capped at 100%."""
+    return {
+        'current': current,
+        'required': required,
+        'remaining': max(0, required - current),
+        'percentage': min(100, (current / required) * 100)
+    }
+
+
 def get_commercial_license_progress(pilot):
     """Calculate progress toward commercial pilot license requirements."""
-    total_times = get_total_times(pilot)
-    xc_pic_time = get_xc_pic_time(pilot)
+    return _commercial_license_progress(get_total_times(pilot))
 
+
+def _commercial_license_progress(total_times):
+    """Commercial license progress from get_total_times output."""
     # Commercial requirements
     required_total = 250
     required_pic = 100
     required_xc_pic = 50
 
-    current_total = total_times['total_time']
-    current_pic = total_times['pic_time']
-
     return {
-        'total_time': {
-            'current': current_total,
-            'required': required_total,
-            'remaining': max(0, required_total - current_total),
-            'percentage': min(100, (current_total / required_total) * 100)
-        },
-        'pic_time': {
-            'current': current_pic,
-            'required': required_pic,
-            'remaining': max(0, required_pic - current_pic),
-            'percentage': min(100, (current_pic / required_pic) * 100)
-        },
-        'xc_pic_time': {
-            'current': xc_pic_time,
-            'required': required_xc_pic,
-            'remaining': max(0, required_xc_pic - xc_pic_time),
-            'percentage': min(100, (xc_pic_time / required_xc_pic) * 100)
-        }
+        'total_time': _requirement_progress(total_times['total_time'], required_total),
+        'pic_time': _requirement_progress(total_times['pic_time'], required_pic),
+        'xc_pic_time': _requirement_progress(total_times['xc_pic_time'], required_xc_pic),
     }
 
 
 def get_instrument_rating_progress(pilot):
     """Calculate progress toward instrument rating (40 hours total, max 20 simulated from simulator, 50 hours XC PIC)."""
-    instrument_breakdown = get_instrument_breakdown(pilot)
-    xc_pic_time = get_xc_pic_time(pilot)
+    total_times = get_total_times(pilot)
+    return _instrument_rating_progress(_instrument_breakdown(pilot, total_times), total_times['xc_pic_time'])
 
+
+def _instrument_rating_progress(instrument_breakdown, xc_pic_time):
+    """Instrument rating progress from an instrument breakdown and XC PIC hours."""
     actual = instrument_breakdown['actual']
     flight_simulated = instrument_breakdown['flight_simulated']
     simulator_simulated = instrument_breakdown['simulator_simulated']
@@ -258,136 +280,140 @@ def get_instrument_rating_progress(pilot):
     }
 
 
-def get_passenger_leaderboard(pilot, limit=10):
-    """Get leaderboard of passengers (Pilots with role PA) ranked by number of flights."""
-    from pilots.models import Pilot
+class PilotStats:
+    """Lazily computed statistics for one pilot, shared between helpers for the lifetime of a request."""
 
-    # Get flights where the pilot was PIC and had passengers
-    flights = Flight.objects.filter(pilot=pilot, excluded=False).prefetch_related('passengers')
+    def __init__(self, pilot):
+        self.pilot = pilot
 
-    # Collect passenger statistics
-    passenger_stats = {}
-    for flight in flights:
-        for passenger in flight.passengers.filter(role=Pilot.RoleChoices.PASSENGER):
-            if passenger.id not in passenger_stats:
-                passenger_stats[passenger.id] = {
-                    'pilot': passenger,
-                    'flight_count': 0,
-                    'total_time': 0
-                }
-            passenger_stats[passenger.id]['flight_count'] += 1
-            passenger_stats[passenger.id]['total_time'] += float(flight.flight_time)
+    @cached_property
+    def total_times(self):
+        return get_total_times(self.pilot)
 
-    # Sort by flight count (descending), then by total time (descending) for ties
-    leaderboard = sorted(
-        passenger_stats.values(),
-        key=lambda x: (x['flight_count'], x['total_time']),
-        reverse=True
-    )[:limit]
+    @cached_property
+    def instrument_breakdown(self):
+        return _instrument_breakdown(self.pilot, self.total_times)
 
-    # Round the total times
-    for entry in leaderboard:
-        entry['total_time'] = round(entry['total_time'], 1)
+    @cached_property
+    def currency(self):
+        return check_passenger_currency(self.pilot)
 
-    return leaderboard
+    @cached_property
+    def commercial_progress(self):
+        return _commercial_license_progress(self.total_times)
 
+    @cached_property
+    def ir_progress(self):
+        return _instrument_rating_progress(self.instrument_breakdown, self.total_times['xc_pic_time'])
 
-def get_instructor_leaderboard(pilot, limit=10):
-    """Get leaderboard of instructors/examiners (Pilots with role I or E) ranked by total time (flights + ground + sim)."""
+    @cached_property
+    def aircraft_breakdown(self):
+        return get_aircraft_breakdown(self.pilot)
+
+    @cached_property
+    def aircraft_highlights(self):
+        return _aircraft_highlights(self.aircraft_breakdown)
+
+    @cached_property
+    def passenger_leaderboard(self):
+        return get_passenger_leaderboard(self.pilot, limit=10)
+
+    @cached_property
+    def instructor_leaderboard(self):
+        return get_instructor_leaderboard(self.pilot, limit=10)
+
+    @cached_property
+    def people_insights(self):
+        return _people_insights(self.pilot, self.passenger_leaderboard, self.instructor_leaderboard)
+
+
+def get_passenger_leaderboard(pilot, limit=10):
+    """Get leaderboard of passengers (Pilots with role PA) ranked by number of flights."""
     from pilots.models import Pilot
 
-    # Get flights where the pilot received instruction
-    flights = Flight.objects.filter(
+    # Count flights and time per passenger on the pilot's flights, best first
+    passenger_rows = Flight.objects.filter(
         pilot=pilot,
-        instructor__isnull=False,
         excluded=False,
-    ).select_related('instructor').filter(
-        Q(instructor__role=Pilot.RoleChoices.INSTRUCTOR) |
-        Q(instructor__role=Pilot.RoleChoices.EXAMINER)
+        passengers__role=Pilot.RoleChoices.PASSENGER,
+    ).values('passengers').annotate(
+        flight_count=Count('id'),
+        total_time=Sum('flight_time'),
+    ).order_by('-flight_count', '-total_time', 'passengers')[:limit]
+
+    passenger_rows = list(passenger_rows)
+    passengers = Pilot.objects.only('first_name', 'last_name').in_bulk(
+        [row['passengers'] for row in passenger_rows]
     )
 
-    # Get ground lessons where the pilot received instruction
-    grounds = Ground.objects.filter(
-        pilot=pilot,
-    ).select_related('instructor').filter(
-        Q(instructor__role=Pilot.RoleChoices.INSTRUCTOR) |
-        Q(instructor__role=Pilot.RoleChoices.EXAMINER)
-    )
+    return [
+        {
+            'pilot': passengers[row['passengers']],
+            'flight_count': row['flight_count'],
+            'total_time': round(float(row['total_time']), 1),
+        }
+        for row in passenger_rows
+    ]
 
-    # Get simulator flights where the pilot received instruction
-    sim_flights = SimulatorFlight.objects.filter(
-        pilot=pilot,
-    ).select_related('instructor').filter(
-        Q(instructor__role=Pilot.RoleChoices.INSTRUCTOR) |
-        Q(instructor__role=Pilot.RoleChoices.EXAMINER)
-    )
 
-    # Collect instructor statistics
-    instructor_stats = {}
+def get_instructor_leaderboard(pilot, limit=10):
+    """Get leaderboard of instructors/examiners (Pilots with role I or E) ranked by total time (flights + ground + sim)."""
+    from pilots.models import Pilot
 
-    # Process flights
-    for flight in flights:
-        instructor = flight.instructor
-        if instructor.id not in instructor_stats:
-            instructor_stats[instructor.id] = {
-                'pilot': instructor,
-                'flight_count': 0,
-                'ground_count': 0,
-                'flight_time': 0,
-                'ground_time': 0,
-                'total_time': 0
-            }
-        instructor_stats[instructor.id]['flight_count'] += 1
-        flight_time = float(flight.flight_time)
-        instructor_stats[instructor.id]['flight_time'] += flight_time
-        instructor_stats[instructor.id]['total_time'] += flight_time
+    is_instructor = Q(instructor__role=Pilot.RoleChoices.INSTRUCTOR) | Q(instructor__role=Pilot.RoleChoices.EXAMINER)
 
-    # Process ground lessons
-    for ground in grounds:
-        instructor = ground.instructor
-        if instructor.id not in instructor_stats:
-            instructor_stats[instructor.id] = {
-                'pilot': instructor,
-                'flight_count': 0,
-                'ground_count': 0,
-                'flight_time': 0,
-                'ground_time': 0,
-                'total_time': 0
-            }
-        instructor_stats[instructor.id]['ground_count'] += 1
-        ground_time = float(ground.ground_time)
-        instructor_stats[instructor.id]['ground_time'] += ground_time
-        instructor_stats[instructor.id]['total_time'] += ground_time
+    # Count and total each kind of instruction per instructor
+    flights = Flight.objects.filter(pilot=pilot, excluded=False).filter(is_instructor).values('instructor').annotate(
+        count=Count('id'), time=Sum('flight_time')
+    ).order_by()
+    grounds = Ground.objects.filter(pilot=pilot).filter(is_instructor).values('instructor').annotate(
+        count=Count('id'), time=Sum('ground_time')
+    ).order_by()
+    sim_flights = SimulatorFlight.objects.filter(pilot=pilot).filter(is_instructor).values('instructor').annotate(
+        count=Count('id'), time=Sum('sim_time')
+    ).order_by()
 
-    # Process simulator flights (count as ground + sim)
-    for sim_flight in sim_flights:
-        instructor = sim_flight.instructor
-        if instructor.id not in instructor_stats:
-            instructor_stats[instructor.id] = {
-                'pilot': instructor,
-                'flight_count': 0,
-                'ground_count': 0,
-                'flight_time': 0,
-                'ground_time': 0,
-                'total_time': 0
-            }
-        instructor_stats[instructor.id]['ground_count'] += 1
-        sim_time = float(sim_flight.sim_time)
-        instructor_stats[instructor.id]['ground_time'] += sim_time
-        instructor_stats[instructor.id]['total_time'] += sim_time
+    # Collect instructor statistics
+    instructor_stats = defaultdict(lambda: {
+        'flight_count': 0,
+        'ground_count': 0,
+        'flight_time': 0,
+        'ground_time': 0,
+        'total_time': 0
+    })
+
+    # Flights count as flight time; ground lessons and simulator flights both count as ground time
+    for rows, count_key, time_key in (
+        (flights, 'flight_count', 'flight_time'),
+        (grounds, 'ground_count', 'ground_time'),
+        (sim_flights, 'ground_count', 'ground_time'),
+    ):
+        for row in rows:
+            stats = instructor_stats[row['instructor']]
+            time = float(row['time'])
+            stats[count_key] += row['count']
+            stats[time_key] += time
+            stats['total_time'] += time
 
     # Sort by total time (descending)
-    leaderboard = sorted(
-        instructor_stats.values(),
-        key=lambda x: x['total_time'],
+    ranked = sorted(
+        instructor_stats.items(),
+        key=lambda item: item[1]['total_time'],
         reverse=True
     )[:limit]
 
-    # Round the times
-    for entry in leaderboard:
-        entry['flight_time'] = round(entry['flight_time'], 1)
-        entry['ground_time'] = round(entry['ground_time'], 1)
-        entry['total_time'] = round(entry['total_time'], 1)
+    # Attach the instructor records and round the times
+    instructors = Pilot.objects.in_bulk([instructor_id for instructor_id, _ in ranked])
+    leaderboard = []
+    for instructor_id, stats in ranked:
+        leaderboard.append({
+            'pilot': instructors[instructor_id],
+            'flight_count': stats['flight_count'],
+            'ground_count': stats['ground_count'],
+            'flight_time': round(stats['flight_time'], 1),
+            'ground_time': round(stats['ground_time'], 1),
+            'total_time': round(stats['total_time'], 1)
+        })
 
     return leaderboard
 
@@ -452,19 +478,27 @@ def get_aircraft_type_statistics(pilot):
 
 def get_aircraft_highlights(pilot):
     """Get highlights about aircraft usage (most/least flown, total unique)."""
-    aircraft_breakdown = get_aircraft_breakdown(pilot)
+    # Only tail number, type and hours are shown, so skip the breakdown's location lookup
+    return _aircraft_highlights(list(_plane_hours(pilot)))
+
 
-    if not aircraft_breakdown:
+def _aircraft_highlights(plane_rows):
+    """Aircraft highlights from per-plane rows sorted by hours, most flown first."""
+    if not plane_rows:
         return {
             'most_flown': None,
             'least_flown': None,
             'total_aircraft': 0
         }
 
+    def highlight(entry):
+        # Same keys whether the rows come from _plane_hours or get_aircraft_breakdown
+        return {'tail_number': entry['tail_number'], 'type': entry['type'], 'hours': float(entry['hours'])}
+
     return {
-        'most_flown': aircraft_breakdown[0],  # First item (sorted by hours descending)
-        'least_flown': aircraft_breakdown[-1],  # Last item
-        'total_aircraft': len(aircraft_breakdown)
+        'most_flown': highlight(plane_rows[0]),  # First item (sorted by hours descending)
+        'least_flown': highlight(plane_rows[-1]),  # Last item
+        'total_aircraft': len(plane_rows)
     }
 
 
@@ -472,25 +506,21 @@ def get_unique_people_counts(pilot):
     """Get counts of unique people the pilot has flown with."""
     from pilots.models import Pilot
 
-    flights = Flight.objects.filter(pilot=pilot, excluded=False).prefetch_related('passengers').select_related('instructor')
-
-    unique_passengers = set()
-    unique_instructors = set()
-    total_interactions = 0
-
-    for flight in flights:
-        # Count passengers
-        passengers = flight.passengers.filter(role=Pilot.RoleChoices.PASSENGER)
-        for passenger in passengers:
-            unique_passengers.add(passenger.id)
+    flights = Flight.objects.filter(pilot=pilot, excluded=False)
 
-        # Count instructors
-        if flight.instructor and flight.instructor.role in [Pilot.RoleChoices.INSTRUCTOR, Pilot.RoleChoices.EXAMINER]:
-            unique_instructors.add(flight.instructor.id)
+    unique_passengers = set(
+        flights.filter(passengers__role=Pilot.RoleChoices.PASSENGER).values_list('passengers', flat=True)
+    )
+    unique_instructors = set(
+        flights.filter(
+            instructor__role__in=[Pilot.RoleChoices.INSTRUCTOR, Pilot.RoleChoices.EXAMINER]
+        ).values_list('instructor', flat=True)
+    )
 
-        # Count total interactions (flights with people)
-        if passengers.exists() or flight.instructor:
-            total_interactions += 1
+    # Count total interactions (flights with passengers or any instructor)
+    total_interactions = flights.filter(
+        Q(passengers__role=Pilot.RoleChoices.PASSENGER) | Q(instructor__isnull=False)
+    ).distinct().count()
 
     return {
         'unique_passengers': len(unique_passengers),
@@ -504,22 +534,20 @@ def get_people_role_distribution(pilot):
     """Get distribution of flights by type (solo, with passengers, with instructor)."""
     from pilots.models import Pilot
 
-    flights = Flight.objects.filter(pilot=pilot, excluded=False).prefetch_related('passengers').select_related('instructor')
-
-    solo_flights = 0
-    passenger_flights = 0
-    instruction_flights = 0
+    has_passengers = Q(passengers__role=Pilot.RoleChoices.PASSENGER)
+    has_instructor = Q(instructor__role__in=[Pilot.RoleChoices.INSTRUCTOR, Pilot.RoleChoices.EXAMINER])
 
-    for flight in flights:
-        has_passengers = flight.passengers.filter(role=Pilot.RoleChoices.PASSENGER).exists()
-        has_instructor = flight.instructor and flight.instructor.role in [Pilot.RoleChoices.INSTRUCTOR, Pilot.RoleChoices.EXAMINER]
+    # Distinct so the join to passengers doesn't count a flight once per passenger
+    counts = Flight.objects.filter(pilot=pilot, excluded=False).aggregate(
+        total_flights=Count('id', distinct=True),
+        passenger_flights=Count('id', filter=has_passengers, distinct=True),
+        instruction_flights=Count('id', filter=has_instructor, distinct=True),
+        flights_with_people=Count('id', filter=has_passengers | has_instructor, distinct=True),
+    )
 
-        if has_passengers:
-            passenger_flights += 1
-        if has_instructor:
-            instruction_flights += 1
-        if not has_passengers and not has_instructor:
-            solo_flights += 1
+    solo_flights = counts['total_flights'] - counts['flights_with_people']
+    passenger_flights = counts['passenger_flights']
+    instruction_flights = counts['instruction_flights']
 
     return {
         'solo_flights': solo_flights,
@@ -531,46 +559,46 @@ def get_people_role_distribution(pilot):
 def get_monthly_people_frequency(pilot, months=12):
     """Get monthly breakdown of flights with people for the last N months."""
     from pilots.models import Pilot
-    from dateutil.relativedelta import relativedelta
 
-    # Get current date and calculate start date
-    now = datetime.now().date()
-    start_date = now - relativedelta(months=months-1)
-    start_date = start_date.replace(day=1)
+    # First day of each month in the range, oldest first
+    month_starts = _month_starts(months)
+    start_date = month_starts[0]
 
     # Get flights in date range
     flights = Flight.objects.filter(
         pilot=pilot,
         date__gte=start_date,
         excluded=False,
-    ).prefetch_related('passengers').select_related('instructor').order_by('date')
+    ).prefetch_related(
+        Prefetch(
+            'passengers',
+            queryset=Pilot.objects.filter(role=Pilot.RoleChoices.PASSENGER).only('id'),
+            to_attr='passenger_list',
+        )
+    ).select_related('instructor').only('date', 'instructor__role').order_by('date')
 
     # Build monthly data structure
     monthly_data = {}
-    current = start_date
-    for _ in range(months):
-        month_key = datetime(current.year, current.month, 1).date()
-        monthly_data[month_key] = {
-            'month': current.strftime('%b %Y'),
+    for month_start in month_starts:
+        monthly_data[month_start] = {
+            'month': month_start.strftime('%b %Y'),
             'total_flights': 0,
             'flights_with_passengers': 0,
             'flights_with_instruction': 0,
             'unique_passengers': set(),
             'unique_instructors': set()
         }
-        current = current + relativedelta(months=1)
 
     # Process flights
     for flight in flights:
-        month_key = datetime(flight.date.year, flight.date.month, 1).date()
+        month_key = flight.date.replace(day=1)
         if month_key in monthly_data:
             monthly_data[month_key]['total_flights'] += 1
 
             # Check for passengers
-            passengers = flight.passengers.filter(role=Pilot.RoleChoices.PASSENGER)
-            if passengers.exists():
+            if flight.passenger_list:
                 monthly_data[month_key]['flights_with_passengers'] += 1
-                for passenger in passengers:
+                for passenger in flight.passenger_list:
                     monthly_data[month_key]['unique_passengers'].add(passenger.id)
 
             # Check for instructor
@@ -596,26 +624,30 @@ def get_monthly_people_frequency(pilot, months=12):
 
 def get_people_insights(pilot):
     """Get insights about flying patterns with people."""
-    from pilots.models import Pilot
-
-    # Get leaderboards
-    passenger_leaderboard = get_passenger_leaderboard(pilot, limit=1)
-    instructor_leaderboard = get_instructor_leaderboard(pilot, limit=1)
-
-    # Get total flight count
-    total_flights = Flight.objects.filter(pilot=pilot, excluded=False).count()
+    return _people_insights(
+        pilot,
+        get_passenger_leaderboard(pilot, limit=1),
+        get_instructor_leaderboard(pilot, limit=1),
+    )
 
-    # Get counts by type
-    flights = Flight.objects.filter(pilot=pilot, excluded=False).prefetch_related('passengers').select_related('instructor')
 
-    flights_with_passengers = 0
-    flights_with_instruction = 0
+def _people_insights(pilot, passenger_leaderboard, instructor_leaderboard):
+    """People insights; only the top entry of each leaderboard is used."""
+    from pilots.models import Pilot
 
-    for flight in flights:
-        if flight.passengers.filter(role=Pilot.RoleChoices.PASSENGER).exists():
-            flights_with_passengers += 1
-        if flight.instructor and flight.instructor.role in [Pilot.RoleChoices.INSTRUCTOR, Pilot.RoleChoices.EXAMINER]:
-            flights_with_instruction += 1
+    # Get total flight count and counts by type; distinct so the passengers join doesn't multiply flights
+    counts = Flight.objects.filter(pilot=pilot, excluded=False).aggregate(
+        total_flights=Count('id', distinct=True),
+        flights_with_passengers=Count('id', filter=Q(passengers__role=Pilot.RoleChoices.PASSENGER), distinct=True),
+        flights_with_instruction=Count(
+            'id',
+            filter=Q(instructor__role__in=[Pilot.RoleChoices.INSTRUCTOR, Pilot.RoleChoices.EXAMINER]),
+            distinct=True,
+        ),
+    )
+    total_flights = counts['total_flights']
+    flights_with_passengers = counts['flights_with_passengers']
+    flights_with_instruction = counts['flights_with_instruction']
 
     # Calculate percentages
     passenger_percentage = round((flights_with_passengers / total_flights * 100) if total_flights > 0 else 0, 1)
@@ -652,54 +684,60 @@ def get_instructor_time_progression(pilot):
         pilot=pilot,
         instructor__isnull=False,
         excluded=False,
-    ).select_related('instructor').filter(
+    ).filter(
         Q(instructor__role=Pilot.RoleChoices.INSTRUCTOR) |
         Q(instructor__role=Pilot.RoleChoices.EXAMINER)
-    ).order_by('date')
+    ).order_by('date', 'id').values(
+        'date', 'instructor_id', 'instructor__first_name', 'instructor__last_name', 'flight_time'
+    )
 
     # Get ground lessons with instructors, ordered chronologically
     grounds = Ground.objects.filter(
         pilot=pilot,
-    ).select_related('instructor').filter(
+    ).filter(
         Q(instructor__role=Pilot.RoleChoices.INSTRUCTOR) |
         Q(instructor__role=Pilot.RoleChoices.EXAMINER)
-    ).order_by('date')
+    ).order_by('date').values(
+        'date', 'instructor_id', 'instructor__first_name', 'instructor__last_name', 'ground_time'
+    )
 
     # Get simulator flights with instructors, ordered chronologically
     sim_flights = SimulatorFlight.objects.filter(
         pilot=pilot,
-    ).select_related('instructor').filter(
+    ).filter(
         Q(instructor__role=Pilot.RoleChoices.INSTRUCTOR) |
         Q(instructor__role=Pilot.RoleChoices.EXAMINER)
-    ).order_by('date')
+    ).order_by('date').values(
+        'date', 'instructor_id', 'instructor__first_name', 'instructor__last_name', 'sim_time'
+    )
 
     # Combine all activities into a single timeline
     all_activities = []
 
     for flight in flights:
         all_activities.append({
-            'date': flight.date,
-            'instructor_id': flight.instructor.id,
-            'instructor_name': f"{flight.instructor.first_name} {flight.instructor.last_name[0]}.",
-            'time': float(flight.flight_time),
+            'date': flight['date'],
+            'instructor_id': flight['instructor_id'],
+            'instructor_name': f"{flight['instructor__first_name']} {flight['instructor__last_name'][0]}.",
+            'time': float(flight['flight_time']),
             'type': 'flight'
         })
 
     for ground in grounds:
         all_activities.append({
-            'date': ground.date,
-            'instructor_id': ground.instructor.id,
-            'instructor_name': f"{ground.instructor.first_name} {ground.instructor.last_name[0]}.",
-            'time': float(ground.ground_time),
+            'date': ground['date'],
+            'instructor_id': ground['instructor_id'],
+            'instructor_name': f"{ground['instructor__first_name']} {ground['instructor__last_name'][0]}.",
+            'time': float(ground['ground_time']),
             'type': 'ground'
         })
 
     for sim_flight in sim_flights:
         all_activities.append({
-            'date': sim_flight.date,
-            'instructor_id': sim_flight.instructor.id,
-            'instructor_name': f"{sim_flight.instructor.first_name} {sim_flight.instructor.last_name[0]}.",
-            'time': float(sim_flight.sim_time),
+            'date': sim_flight['date'],
+            'instructor_id': sim_flight['instructor_id'],
+            'instructor_name': f"{sim_flight['instructor__first_name']} {sim_flight['instructor__last_name'][0]}.",
+            'time': float(sim_flight['sim_time']),
             'type': 'sim'
         })
 
@@ -726,7 +764,7 @@ def get_instructor_time_progression(pilot):
 
         # Record this data point
         progression_data.append({
-            'date': activity['date'].strftime('%Y-%m-%d'),
+            'date': activity['date'].isoformat(),
             'instructor_id': instructor_id,
             'instructor_name': instructor_name,
             'cumulative_time': round(instructor_cumulative[instructor_id]['cumulative_time'], 1)
@@ -744,22 +782,17 @@ def get_instructor_time_progression(pilot):
 
     # For each unique date, record each instructor's cumulative time at that point
     # This ensures smooth lines even when an instructor doesn't fly on a particular date
-    unique_dates = sorted(set(d['date'] for d in progression_data))
-
-    for date in unique_dates:
-        # Get the latest cumulative time for each instructor up to this date
-        for instructor_id in instructors:
-            # Find the last data point for this instructor up to this date
-            instructor_data_up_to_date = [
-                d for d in progression_data
-                if d['instructor_id'] == instructor_id and d['date'] <= date
-            ]
-
-            if instructor_data_up_to_date:
-                latest = instructor_data_up_to_date[-1]
-                instructors[instructor_id]['data'].append({
-                    'x': date,
-                    'y': latest['cumulative_time']
+    # progression_data is chronological, so one pass keeps each instructor's latest cumulative time
+    latest_cumulative = {}
+    for point_date, data_points in groupby(progression_data, key=itemgetter('date')):
+        for data_point in data_points:
+            latest_cumulative[data_point['instructor_id']] = data_point['cumulative_time']
+
+        for instructor_id, instructor in instructors.items():
+            if instructor_id in latest_cumulative:
+                instructor['data'].append({
+                    'x': point_date,
+                    'y': latest_cumulative[instructor_id]
                 })
 
     return {
@@ -770,22 +803,22 @@ def get_instructor_time_progression(pilot):
 
 def get_airport_departure_progression(pilot):
     """Get cumulative departure count progression data for each airport showing when airports 'overtake' each other."""
-    from routes.models import RouteWaypoint
-
     # Get all flights with routes, ordered chronologically
     flights = Flight.objects.filter(
         pilot=pilot,
         route__isnull=False,
         excluded=False,
-    ).select_related('route').prefetch_related('route__route_steps__waypoint').order_by('date')
+    ).select_related('route').prefetch_related('route__route_steps__waypoint').only('date', 'route').order_by('date', 'id')
 
     # Build cumulative departure count for each airport
     airport_cumulative = {}
     progression_data = []
 
     for flight in flights:
-        # Get the first waypoint of the route (departure airport)
-        first_waypoint = flight.route.route_steps.order_by('sequence').first()
+        # Get the first waypoint of the route (departure airport), from the prefetch;
+        # RouteWaypoint.Meta.ordering already sorts steps by sequence
+        steps = flight.route.route_steps.all()
+        first_waypoint = steps[0] if steps else None
 
         if first_waypoint:
             airport_code = first_waypoint.waypoint.code
@@ -803,7 +836,7 @@ def get_airport_departure_progression(pilot):
 
             # Record this data point
             progression_data.append({
-                'date': flight.date.strftime('%Y-%m-%d'),
+                'date': flight.date.isoformat(),
                 'airport_code': airport_code,
                 'airport_name': airport_name,
                 'count': airport_cumulative[airport_code]['count']
@@ -821,22 +854,17 @@ def get_airport_departure_progression(pilot):
 
     # For each unique date, record each airport's cumulative count at that point
     # This ensures smooth lines even when an airport doesn't have a departure on a particular date
-    unique_dates = sorted(set(d['date'] for d in progression_data))
-
-    for date in unique_dates:
-        # Get the latest cumulative count for each airport up to this date
-        for airport_code in airports:
-            # Find the last data point for this airport up to this date
-            airport_data_up_to_date = [
-                d for d in progression_data
-                if d['airport_code'] == airport_code and d['date'] <= date
-            ]
-
-            if airport_data_up_to_date:
-                latest = airport_data_up_to_date[-1]
-                airports[airport_code]['data'].append({
-                    'x': date,
-                    'y': latest['count']
+    # progression_data is chronological, so one pass keeps each airport's latest cumulative count
+    latest_count = {}
+    for point_date, data_points in groupby(progression_data, key=itemgetter('date')):
+        for data_point in data_points:
+            latest_count[data_point['airport_code']] = data_point['count']
+
+        for airport_code, airport in airports.items():
+            if airport_code in latest_count:
+                airport['data'].append({
+                    'x': point_date,
+                    'y': latest_count[airport_code]
                 })
 
     return {
@@ -1,51 +1,58 @@
 import json
 import math
-from datetime import date
+from functools import lru_cache
+from itertools import groupby
+from operator import itemgetter
 
+from django.db.models import Count
 from django.shortcuts import render
 
 from flights.models import Flight
-from flights.utils.currency_calculator import check_license_status, check_medical_status, check_passenger_currency
+from flights.utils.currency_calculator import check_license_status, check_medical_status
 from flights.utils.statistics import (
-    get_aircraft_breakdown,
+    PilotStats,
     get_aircraft_class_breakdown,
-    get_aircraft_highlights,
     get_aircraft_type_statistics,
     get_airport_departure_progression,
-    get_commercial_license_progress,
     get_cumulative_time_data,
-    get_last_flight_date,
-    get_instructor_leaderboard,
+    get_days_since_last_flight,
     get_instructor_time_progression,
-    get_instrument_breakdown,
-    get_instrument_rating_progress,
     get_monthly_breakdown,
     get_monthly_people_frequency,
-    get_passenger_leaderboard,
-    get_people_insights,
     get_people_role_distribution,
     get_recent_flights,
     get_sel_total_hours,
     get_total_approaches,
-    get_total_times,
     get_unique_people_counts,
 )
 from pilots.models import Pilot
-from routes.models import Route
+from routes.models import RouteWaypoint
 
 
+# Serialize chart/map data for embedding in a template, without whitespace padding
+to_json = json.JSONEncoder(separators=(',', ':')).encode
+
+
+def _radian_coords(lat, lon):
+    """Convert a waypoint to radians, returning (lat, lon, cos(lat))."""
+    lat = math.radians(lat)
+    return lat, math.radians(lon), math.cos(lat)
+
+
+@lru_cache(maxsize=4096)
 def haversine_distance(lat1, lon1, lat2, lon2):
     """
     Calculate the great circle distance in nautical miles between two points
-    on the earth (specified in decimal degrees).
+    on the earth (specified in decimal degrees). Cached, as legs recur across routes.
     """
     # Convert decimal degrees to radians
-    lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
+    lat1, lon1, cos_lat1 = _radian_coords(lat1, lon1)
+    lat2, lon2, cos_lat2 = _radian_coords(lat2, lon2)
 
     # Haversine formula
-    dlat = lat2 - lat1
-    dlon = lon2 - lon1
-    a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
+    sin_half_dlat = math.sin((lat2 - lat1) * 0.5)
+    sin_half_dlon = math.sin((lon2 - lon1) * 0.5)
+    a = sin_half_dlat * sin_half_dlat + cos_lat1 * cos_lat2 * sin_half_dlon * sin_half_dlon
     c = 2 * math.asin(math.sqrt(a))
 
     # Radius of earth in nautical miles
@@ -53,54 +60,57 @@ def haversine_distance(lat1, lon1, lat2, lon2):
     return c * nm
 
 
+def route_distance(waypoints_data):
+    """Total great circle distance in nautical miles along an ordered list of waypoints."""
+    return sum(
+        haversine_distance(start['lat'], start['lon'], end['lat'], end['lon'])
+        for start, end in zip(waypoints_data, waypoints_data[1:])
+    )
+
+
 def get_routes_data(pilot):
     """Build route map JSON payload shared by dashboard and routes page."""
-    flights = Flight.objects.filter(pilot=pilot).select_related('route').prefetch_related('route__waypoints')
+    route_counts = dict(
+        Flight.objects.filter(pilot=pilot).values_list('route_id').annotate(flight_count=Count('id'))
+    )
+
+    steps = RouteWaypoint.objects.filter(route_id__in=route_counts).order_by('route_id', 'sequence').values_list(
+        'route_id', 'route__name', 'waypoint__code', 'waypoint__name', 'waypoint__latitude', 'waypoint__longitude'
+    )
+    # Flights through each airport, counting a flight once even if its route revisits the airport
+    airport_visits = dict(
+        Flight.objects.filter(pilot=pilot)
+        .values_list('route__waypoints__code')
+        .annotate(visits=Count('id', distinct=True))
+    )
     unique_routes = {}
-    route_counts = {}
-    airport_visits = {}
-
-    for flight in flights:
-        if flight.route:
-            route_id = flight.route.id
-            route_counts[route_id] = route_counts.get(route_id, 0) + 1
-            waypoints = flight.route.waypoints.all()
-            unique_airports_in_flight = {wp.code for wp in waypoints}
-            for code in unique_airports_in_flight:
-                airport_visits[code] = airport_visits.get(code, 0) + 1
-
-            if route_id not in unique_routes:
-                ordered = flight.route.waypoints.all().order_by('routewaypoint__sequence')
-                waypoints_data = [
-                    {
-                        'code': wp.code,
-                        'name': wp.name,
-                        'lat': float(wp.latitude),
-                        'lon': float(wp.longitude),
-                        'visit_count': 0,
-                    }
-                    for wp in ordered if wp.latitude and wp.longitude
-                ]
-                if waypoints_data:
-                    total_distance = sum(
-                        haversine_distance(
-                            waypoints_data[i]['lat'], waypoints_data[i]['lon'],
-                            waypoints_data[i + 1]['lat'], waypoints_data[i + 1]['lon'],
-                        )
-                        for i in range(len(waypoints_data) - 1)
-                    )
-                    unique_routes[route_id] = {
-                        'id': flight.route.id,
-                        'name': flight.route.name,
-                        'waypoints': waypoints_data,
-                        'flight_count': 0,
-                        'distance': round(total_distance, 1),
-                    }
+
+    for route_id, route_steps in groupby(steps, key=itemgetter(0)):
+        route_steps = list(route_steps)
+        waypoints_data = [
+            {
+                'code': code,
+                'name': name,
+                'lat': float(latitude),
+                'lon': float(longitude),
+                'visit_count': 0,
+            }
+            for _, _, code, name, latitude, longitude in route_steps if latitude and longitude
+        ]
+        if waypoints_data:
+            total_distance = route_distance(waypoints_data)
+            unique_routes[route_id] = {
+                'id': route_id,
+                'name': route_steps[0][1],
+                'waypoints': waypoints_data,
+                'flight_count': 0,
+                'distance': round(total_distance, 1),
+            }
 
     for route_id, route in unique_routes.items():
-        route['flight_count'] = route_counts.get(route_id, 0)
+        route['flight_count'] = route_counts[route_id]
         for wp in route['waypoints']:
-            wp['visit_count'] = airport_visits.get(wp['code'], 0)
+            wp['visit_count'] = airport_visits[wp['code']]
 
     return list(unique_routes.values())
 
@@ -127,21 +137,21 @@ def dashboard(request):
             'cumulative_data': [],
             'aircraft_breakdown': [],
             'recent_flights': [],
-            'last_flight_date': None,
+            'days_since_last_flight': None,
         })
 
     # Gather all statistics
-    total_times = get_total_times(pilot)
+    stats = PilotStats(pilot)
+    total_times = stats.total_times
     total_approaches = get_total_approaches(pilot)
-    currency = check_passenger_currency(pilot)
+    currency = stats.currency
     medical = check_medical_status(pilot)
     license = check_license_status(pilot)
-    ir_progress = get_instrument_rating_progress(pilot)
-    commercial_progress = get_commercial_license_progress(pilot)
-    instrument_breakdown = get_instrument_breakdown(pilot)
-    recent_flights = get_recent_flights(pilot, limit=5)
-    last_flight_date = get_last_flight_date(pilot)
-    days_since_last_flight = (date.today() - last_flight_date).days if last_flight_date else None
+    instrument_breakdown = stats.instrument_breakdown
+    ir_progress = stats.ir_progress
+    commercial_progress = stats.commercial_progress
+    recent_flights = list(get_recent_flights(pilot, limit=5))
+    days_since_last_flight = get_days_since_last_flight(pilot)
 
     # Get monthly data for charts
     monthly_data = get_monthly_breakdown(pilot, months=12)
@@ -165,15 +175,14 @@ def dashboard(request):
         'license': license,
         'ir_progress': ir_progress,
         'commercial_progress': commercial_progress,
-        'monthly_labels': json.dumps(monthly_labels),
-        'monthly_hours': json.dumps(monthly_hours),
+        'monthly_labels': to_json(monthly_labels),
+        'monthly_hours': to_json(monthly_hours),
         'instrument_breakdown': instrument_breakdown,
-        'cumulative_data': json.dumps(cumulative_data),
-        'instructor_progression': json.dumps(instructor_progression),
+        'cumulative_data': to_json(cumulative_data),
+        'instructor_progression': to_json(instructor_progression),
         'recent_flights': recent_flights,
-        'last_flight_date': last_flight_date,
         'days_since_last_flight': days_since_last_flight,
-        'routes_json': json.dumps(routes_data),
+        'routes_json': to_json(routes_data),
     }
 
     return render(request, 'flights/dashboard.html', context)
@@ -195,7 +204,9 @@ def logbook(request):
         })
 
     # Get all flights for this pilot, ordered by date (most recent first)
-    flights = Flight.objects.filter(pilot=pilot).select_related('plane', 'instructor').prefetch_related('approaches').order_by('-date')
+    flights = Flight.objects.filter(pilot=pilot).select_related('plane', 'instructor', 'route').prefetch_related(
+        'approaches', 'route__route_steps__waypoint'
+    ).order_by('-date')
 
     context = {
         'flights': flights,
@@ -220,8 +231,8 @@ def routes_map(request):
     airport_progression = get_airport_departure_progression(pilot)
 
     context = {
-        'routes_json': json.dumps(get_routes_data(pilot)),
-        'airport_progression': json.dumps(airport_progression),
+        'routes_json': to_json(get_routes_data(pilot)),
+        'airport_progression': to_json(airport_progression),
     }
 
     return render(request, 'flights/routes_map.html', context)
@@ -244,11 +255,12 @@ def aircraft(request):
         })
 
     # Gather aircraft statistics
+    stats = PilotStats(pilot)
     sel_hours = get_sel_total_hours(pilot)
     aircraft_class_breakdown = get_aircraft_class_breakdown(pilot)
     aircraft_type_statistics = get_aircraft_type_statistics(pilot)
-    aircraft_highlights = get_aircraft_highlights(pilot)
-    aircraft_breakdown = get_aircraft_breakdown(pilot)
+    aircraft_breakdown = stats.aircraft_breakdown
+    aircraft_highlights = stats.aircraft_highlights
 
     # Prepare chart data
     class_labels = list(aircraft_class_breakdown.keys())
@@ -263,10 +275,10 @@ def aircraft(request):
         'aircraft_type_statistics': aircraft_type_statistics,
         'aircraft_highlights': aircraft_highlights,
         'aircraft_breakdown': aircraft_breakdown,
-        'class_labels': json.dumps(class_labels),
-        'class_hours': json.dumps(class_hours),
-        'type_labels': json.dumps(type_labels),
-        'type_hours': json.dumps(type_hours),
+        'class_labels': to_json(class_labels),
+        'class_hours': to_json(class_hours),
+        'type_labels': to_json(type_labels),
+        'type_hours': to_json(type_hours),
     }
 
     return render(request, 'flights/aircraft.html', context)
@@ -290,11 +302,12 @@ def people(request):
         })
 
     # Gather people statistics
+    stats = PilotStats(pilot)
     unique_people_counts = get_unique_people_counts(pilot)
     people_role_distribution = get_people_role_distribution(pilot)
-    passenger_leaderboard = get_passenger_leaderboard(pilot, limit=10)
-    instructor_leaderboard = get_instructor_leaderboard(pilot, limit=10)
-    people_insights = get_people_insights(pilot)
+    passenger_leaderboard = stats.passenger_leaderboard
+    instructor_leaderboard = stats.instructor_leaderboard
+    people_insights = stats.people_insights
     monthly_people_data = get_monthly_people_frequency(pilot, months=12)
 
     # Prepare chart data for role distribution pie chart
@@ -317,12 +330,12 @@ def people(request):
         'passenger_leaderboard': passenger_leaderboard,
         'instructor_leaderboard': instructor_leaderboard,
         'people_insights': people_insights,
-        'role_labels': json.dumps(role_labels),
-        'role_counts': json.dumps(role_counts),
-        'monthly_labels': json.dumps(monthly_labels),
-        'monthly_total_flights': json.dumps(monthly_total_flights),
-        'monthly_passenger_flights': json.dumps(monthly_passenger_flights),
-        'monthly_instruction_flights': json.dumps(monthly_instruction_flights),
+        'role_labels': to_json(role_labels),
+        'role_counts': to_json(role_counts),
+        'monthly_labels': to_json(monthly_labels),
+        'monthly_total_flights': to_json(monthly_total_flights),
+        'monthly_passenger_flights': to_json(monthly_passenger_flights),
+        'monthly_instruction_flights': to_json(monthly_instruction_flights),
     }
 
     return render(request, 'flights/people.html', context)
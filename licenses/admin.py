@@ -5,6 +5,7 @@ from licenses.models import License
 
 class LicenseAdmin(admin.ModelAdmin):
     list_display = ("type", "number", "pilot", "expiration")
+    list_select_related = ("pilot",)
     search_fields = ("number", "pilot__first_name", "pilot__last_name")
 
 
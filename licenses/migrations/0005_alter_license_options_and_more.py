@@ -0,0 +1,22 @@
+# Generated by Django 6.0 on 2026-10-15 13:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('licenses', '0004_alter_license_type'),
+        ('pilots', '0006_remove_pilot_medical_certificate'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='license',
+            options={'ordering': ['expiration']},
+        ),
+        migrations.AddIndex(
+            model_name='license',
+            index=models.Index(fields=['pilot', 'expiration'], name='license_pilot_expiration_idx'),
+        ),
+    ]
@@ -15,5 +15,11 @@ class License(models.Model):
     number = models.IntegerField()
     expiration = models.DateField(null=True, blank=True)
 
+    class Meta:
+        ordering = ["expiration"]
+        indexes = [
+            models.Index(fields=["pilot", "expiration"], name="license_pilot_expiration_idx"),
+        ]
+
     def __str__(self):
         return f"{self.pilot}: {self.type} {self.number}"
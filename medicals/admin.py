@@ -5,6 +5,7 @@ from medicals.models import Medical
 
 class MedicalAdmin(admin.ModelAdmin):
     list_display = ("__str__", "classNumber", "pilot", "examination_date")
+    list_select_related = ("pilot",)
     search_fields = ("pilot__first_name", "pilot__last_name", "examiner_name")
 
 
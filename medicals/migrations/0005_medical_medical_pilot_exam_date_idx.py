@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-15 05:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('medicals', '0004_remove_medical_number_medical_examination_date_and_more'),
+        ('pilots', '0006_remove_pilot_medical_certificate'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='medical',
+            index=models.Index(fields=['pilot', '-examination_date'], name='medical_pilot_exam_date_idx'),
+        ),
+    ]
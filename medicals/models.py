@@ -1,11 +1,21 @@
+from calendar import monthrange
 from datetime import date
-from dateutil.relativedelta import relativedelta
 
 from django.db import models
 
 from pilots.models import Pilot
 
 
+_CLASS_NAMES = {1: "First Class", 2: "Second Class", 3: "Third Class"}
+
+
+def _end_of_month_after(start, months):
+    """Last day of the calendar month `months` months after `start`."""
+    year, month = divmod(start.year * 12 + start.month - 1 + months, 12)
+    month += 1
+    return date(year, month, monthrange(year, month)[1])
+
+
 class Medical(models.Model):
     class ClassNumbers(models.IntegerChoices):
         FIRST = 1
@@ -18,88 +28,69 @@ class Medical(models.Model):
     examiner_designation_number = models.CharField(max_length=9)
     pilot = models.ForeignKey(Pilot, on_delete=models.CASCADE, related_name="medical")
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["pilot", "-examination_date"], name="medical_pilot_exam_date_idx"),
+        ]
+
     def __str__(self):
-        res = str(self.pilot)
-        if self.classNumber == 1:
-            res += " First Class"
-        elif self.classNumber == 2:
-            res += " Second Class"
-        else:
-            res += " Third Class"
-        return res
+        return f"{self.pilot} {_CLASS_NAMES.get(self.classNumber, 'Third Class')}"
 
     def get_first_class_expiry(self):
         """Calculate when 1st class privileges expire (12 calendar months)."""
         if self.classNumber != 1:
             return None
         # Last day of the month, 12 months after examination
-        expiry = self.examination_date + relativedelta(months=12)
-        # Get last day of that month
-        next_month = expiry + relativedelta(months=1, day=1)
-        return next_month - relativedelta(days=1)
+        return _end_of_month_after(self.examination_date, 12)
 
     def get_second_class_expiry(self):
         """Calculate when 2nd class privileges expire (12 calendar months)."""
         if self.classNumber not in [1, 2]:
             return None
         # Last day of the month, 12 months after examination
-        expiry = self.examination_date + relativedelta(months=12)
-        # Get last day of that month
-        next_month = expiry + relativedelta(months=1, day=1)
-        return next_month - relativedelta(days=1)
+        return _end_of_month_after(self.examination_date, 12)
 
     def get_third_class_expiry(self):
         """Calculate when 3rd class privileges expire (60 calendar months)."""
         # All medical classes can exercise 3rd class privileges
         # Last day of the month, 60 months after examination
-        expiry = self.examination_date + relativedelta(months=60)
-        # Get last day of that month
-        next_month = expiry + relativedelta(months=1, day=1)
-        return next_month - relativedelta(days=1)
+        return _end_of_month_after(self.examination_date, 60)
 
-    def get_current_privilege_level(self, as_of_date=None):
+    def get_current_privileges(self, as_of_date=None):
         """
-        Determine the current privilege level this medical allows.
+        Determine the current privilege level this medical allows and when it expires.
+        Callers checking several medicals should pass one as_of_date to all of them.
 
         Returns:
-            int: 1, 2, 3, or None if expired
+            tuple: (1, 2, 3, or None if expired; expiry date of that level or None)
         """
         if as_of_date is None:
             as_of_date = date.today()
 
-        # Check 1st class (only if original cert was 1st class)
-        if self.classNumber == 1:
-            first_expiry = self.get_first_class_expiry()
-            if as_of_date <= first_expiry:
-                return 1
-
-        # Check 2nd class (if original cert was 1st or 2nd class)
+        # 1st class privileges (1st class certs) and 2nd class privileges
+        # (1st or 2nd class certs) both run 12 calendar months
         if self.classNumber in [1, 2]:
-            second_expiry = self.get_second_class_expiry()
-            if as_of_date <= second_expiry:
-                return 2
+            expiry = _end_of_month_after(self.examination_date, 12)
+            if as_of_date <= expiry:
+                return self.classNumber, expiry
 
         # Check 3rd class (all certs can exercise 3rd class)
         third_expiry = self.get_third_class_expiry()
         if as_of_date <= third_expiry:
-            return 3
+            return 3, third_expiry
 
         # Completely expired
-        return None
-
-    def get_next_expiration_date(self, as_of_date=None):
-        """Get the next upcoming expiration date for current privileges."""
-        if as_of_date is None:
-            as_of_date = date.today()
+        return None, None
 
-        current_level = self.get_current_privilege_level(as_of_date)
+    def get_current_privilege_level(self, as_of_date=None):
+        """
+        Determine the current privilege level this medical allows.
 
-        if current_level == 1:
-            return self.get_first_class_expiry()
-        elif current_level == 2:
-            return self.get_second_class_expiry()
-        elif current_level == 3:
-            return self.get_third_class_expiry()
+        Returns:
+            int: 1, 2, 3, or None if expired
+        """
+        return self.get_current_privileges(as_of_date)[0]
 
-        # Already expired
-        return None
+    def get_next_expiration_date(self, as_of_date=None):
+        """Get the next upcoming expiration date for current privileges."""
+        return self.get_current_privileges(as_of_date)[1]
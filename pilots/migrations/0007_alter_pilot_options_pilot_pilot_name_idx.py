@@ -0,0 +1,21 @@
+# Generated by Django 6.0 on 2026-10-15 05:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pilots', '0006_remove_pilot_medical_certificate'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='pilot',
+            options={'ordering': ['last_name', 'first_name']},
+        ),
+        migrations.AddIndex(
+            model_name='pilot',
+            index=models.Index(fields=['last_name', 'first_name'], name='pilot_name_idx'),
+        ),
+    ]
@@ -12,5 +12,11 @@ class Pilot(models.Model):
     last_name = models.CharField(max_length=50)
     role = models.CharField(choices=RoleChoices.choices, max_length=2)
 
+    class Meta:
+        ordering = ["last_name", "first_name"]
+        indexes = [
+            models.Index(fields=["last_name", "first_name"], name="pilot_name_idx"),
+        ]
+
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
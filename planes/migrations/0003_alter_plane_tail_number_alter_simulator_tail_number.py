@@ -0,0 +1,23 @@
+# Generated by Django 6.0 on 2026-10-15 05:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planes', '0002_rename_sim_type_simulator_sim_class_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='plane',
+            name='tail_number',
+            field=models.CharField(db_index=True, max_length=6),
+        ),
+        migrations.AlterField(
+            model_name='simulator',
+            name='tail_number',
+            field=models.CharField(db_index=True, max_length=6),
+        ),
+    ]
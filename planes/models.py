@@ -6,7 +6,7 @@ class Plane(models.Model):
         SEL = "Single Engine Land"
         MEL = "Multi Engine Land"
 
-    tail_number = models.CharField(max_length=6)
+    tail_number = models.CharField(max_length=6, db_index=True)
     type = models.CharField(max_length=4)
     plane_class = models.CharField(choices=PlaneClass.choices, max_length=20)
 
@@ -21,7 +21,7 @@ class Simulator(models.Model):
         BATD = "BATD"
         AATD = "AATD"
 
-    tail_number = models.CharField(max_length=6)
+    tail_number = models.CharField(max_length=6, db_index=True)
     type = models.CharField(max_length=20)
     sim_class = models.CharField(choices=SimClass.choices, max_length=4)
 
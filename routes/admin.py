@@ -1,4 +1,5 @@
 from django.contrib import admin
+from django.db.models import StringAgg, Value
 
 from routes.models import Airport, Route, RouteWaypoint
 
@@ -11,13 +12,24 @@ class AirportAdmin(admin.ModelAdmin):
 
 
 class RouteAdmin(admin.ModelAdmin):
-    list_display = ["name"]
+    list_display = ["name", "path_display"]
     search_fields = ("name",)
 
     def get_queryset(self, request):
-        # We tell Django: "When you fetch Routes, grab the waypoints too!"
+        # Build each route's path in SQL for the Path column. The action
+        # checkboxes still label rows with str(route), so prefetch the steps too
         qs = super().get_queryset(request)
-        return qs.prefetch_related("route_steps__waypoint")
+        return qs.annotate(
+            path_codes=StringAgg(
+                "route_steps__waypoint__code",
+                delimiter=Value(" -> "),
+                order_by="route_steps__sequence",
+            )
+        ).prefetch_related("route_steps__waypoint")
+
+    @admin.display(description="Path")
+    def path_display(self, obj):
+        return obj.path_codes or "No waypoints assigned"
 
 
 class RouteWaypointAdmin(admin.ModelAdmin):
@@ -6,7 +6,9 @@ Usage:
 """
 
 from django.core.management.base import BaseCommand
+from django.db import transaction
 import csv
+from itertools import islice
 
 from routes.models import Airport
 
@@ -14,33 +16,51 @@ from routes.models import Airport
 class Command(BaseCommand):
     help = "Takes airport.csv file from https://ourairports.com/data/ and puts it in DB"  # A helpful description
     file = "airports.csv"
+    batch_size = 5000
+    columns = (
+        "ident",
+        "icao_code",
+        "name",
+        "latitude_deg",
+        "longitude_deg",
+        "iso_country",
+        "municipality",
+    )
+    required_columns = ("name", "latitude_deg", "longitude_deg", "municipality", "iso_country")
 
     def handle(self, *args, **options):
-        airports = []
         try:
-            with open(self.file) as csv_file:
-                csv_reader = csv.DictReader(csv_file, delimiter=",")
-                count, _ = Airport.objects.all().delete()
-                self.stdout.write(
-                    self.style.WARNING(f"Deleted {count} existing records.")
-                )
+            with open(self.file) as csv_file, transaction.atomic():
+                csv_reader = csv.reader(csv_file, delimiter=",")
+                # Resolve column positions once rather than building a dict per row
+                header = next(csv_reader)
+                idx = {column: header.index(column) for column in self.columns}
                 skipped_airports = 0
-                for row in csv_reader:
-                    if not self._validate_airport(row):
-                        skipped_airports += 1
-                        continue
-                    name = row["name"]
-                    latitude = float(row["latitude_deg"])
-                    longitude = float(row["longitude_deg"])
-                    country = row["iso_country"]
-                    municipality = row["municipality"]
-                    if row["icao_code"]:
-                        code = row["icao_code"]
-                    else:
-                        code = row["ident"]
+                imported_airports = 0
+                seen_codes = set()
 
-                    airports.append(
-                        Airport(
+                def parse_airports():
+                    nonlocal skipped_airports
+                    for row in csv_reader:
+                        if not self._validate_airport(row, idx):
+                            skipped_airports += 1
+                            continue
+                        name = row[idx["name"]]
+                        latitude = float(row[idx["latitude_deg"]])
+                        longitude = float(row[idx["longitude_deg"]])
+                        country = row[idx["iso_country"]]
+                        municipality = row[idx["municipality"]]
+                        if row[idx["icao_code"]]:
+                            code = row[idx["icao_code"]]
+                        else:
+                            code = row[idx["ident"]]
+                        # An upsert can't touch the same code twice; keep the first row
+                        if code in seen_codes:
+                            skipped_airports += 1
+                            continue
+                        seen_codes.add(code)
+
+                        yield Airport(
                             code=code,
                             name=name,
                             latitude=latitude,
@@ -48,13 +68,24 @@ class Command(BaseCommand):
                             country=country,
                             municipality=municipality,
                         )
+
+                # Upsert one batch at a time so only batch_size Airport
+                # objects are in memory. Existing airports are updated in
+                # place, keeping the routes and approaches that point at them.
+                airports = parse_airports()
+                while batch := list(islice(airports, self.batch_size)):
+                    Airport.objects.bulk_create(
+                        batch,
+                        update_conflicts=True,
+                        unique_fields=["code"],
+                        update_fields=["name", "latitude", "longitude", "country", "municipality"],
                     )
-            Airport.objects.bulk_create(airports)
+                    imported_airports += len(batch)
             self.stdout.write(
                 self.style.WARNING(f"Skipped {skipped_airports} airport records")
             )
             self.stdout.write(
-                self.style.SUCCESS(f"Imported {len(airports)} airport records")
+                self.style.SUCCESS(f"Imported {imported_airports} airport records")
             )
         except FileNotFoundError:
             self.stderr.write(
@@ -62,21 +93,16 @@ class Command(BaseCommand):
             )
             exit(1)
 
-    def _validate_airport(self, row):
+    def _validate_airport(self, row, idx):
         """
         Validates airport entry
         :param row: airport info from csv file
+        :param idx: column name to position in row
         :returns: Whether to add this row to DB
         :rtype: bool
         """
         # For now just get airports with code length <= 4
-        if (
-            (not row["icao_code"] and (not row["ident"]) or len(row["ident"]) > 4)
-            or not row["name"]
-            or not row["latitude_deg"]
-            or not row["longitude_deg"]
-            or not row["municipality"]
-            or not row["iso_country"]
-        ):
+        code = row[idx["icao_code"]] or row[idx["ident"]]
+        if not code or len(code) > 4:
             return False
-        return True
+        return all(row[idx[column]] for column in self.required_columns)
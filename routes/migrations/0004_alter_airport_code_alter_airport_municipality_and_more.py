@@ -0,0 +1,28 @@
+# Generated by Django 6.0 on 2026-10-15 05:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('routes', '0003_airport_country'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='airport',
+            name='code',
+            field=models.CharField(db_index=True, max_length=4),
+        ),
+        migrations.AlterField(
+            model_name='airport',
+            name='municipality',
+            field=models.CharField(max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='airport',
+            name='name',
+            field=models.CharField(max_length=255),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 6.0 on 2026-10-15 05:31
+
+from django.db import migrations
+from django.db.models import Count, Min
+
+
+def merge_duplicate_codes(apps, schema_editor):
+    """Point routes and approaches at the oldest airport per code, then drop the rest."""
+    Airport = apps.get_model('routes', 'Airport')
+    RouteWaypoint = apps.get_model('routes', 'RouteWaypoint')
+    Approach = apps.get_model('flights', 'Approach')
+
+    duplicates = Airport.objects.values('code').annotate(keep=Min('id'), copies=Count('id')).filter(copies__gt=1)
+    for duplicate in duplicates:
+        extras = Airport.objects.filter(code=duplicate['code']).exclude(id=duplicate['keep'])
+        RouteWaypoint.objects.filter(waypoint__in=extras).update(waypoint=duplicate['keep'])
+        Approach.objects.filter(airport__in=extras).update(airport=duplicate['keep'])
+        extras.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('flights', '0019_flight_flight_pilot_plane_idx'),
+        ('routes', '0004_alter_airport_code_alter_airport_municipality_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_codes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 6.0 on 2026-10-15 05:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # Kept apart from the duplicate merge in 0005: on PostgreSQL, deleting the
+    # merged airports queues deferred FK checks that block ALTER TABLE in the
+    # same transaction.
+    dependencies = [
+        ('routes', '0005_merge_duplicate_airport_codes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='airport',
+            name='code',
+            field=models.CharField(max_length=4, unique=True),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 6.0 on 2026-10-15 05:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('routes', '0006_airport_code_unique'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='routewaypoint',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='routewaypoint',
+            constraint=models.UniqueConstraint(fields=('route', 'sequence'), name='routewaypoint_route_sequence_unique'),
+        ),
+    ]
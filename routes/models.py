@@ -2,12 +2,12 @@ from django.db import models
 
 
 class Airport(models.Model):
-    code = models.CharField(max_length=4)
-    name = models.TextField()
+    code = models.CharField(max_length=4, unique=True)
+    name = models.CharField(max_length=255)
     latitude = models.FloatField()
     longitude = models.FloatField()
     country = models.CharField(max_length=2)
-    municipality = models.TextField()
+    municipality = models.CharField(max_length=255)
 
     def __str__(self):
         return f"{self.code} - {self.name}"
@@ -19,20 +19,25 @@ class Route(models.Model):
         Airport, through="RouteWaypoint", related_name="flights_through"
     )
 
-    def __str__(self):
+    @property
+    def path(self):
+        """Waypoint codes in sequence order, e.g. "KBFI -> KRNT -> KBFI"."""
         # 1. Fetch the waypoint codes associated with this route in order
-        # We use 'route_steps' because that is the related_name on the RouteWaypoint model
-        stops = (
-            self.route_steps.all()
-            .order_by("sequence")
-            .values_list("waypoint__code", flat=True)
-        )
+        # We use 'route_steps' because that is the related_name on the RouteWaypoint model.
+        # RouteWaypoint.Meta.ordering sorts by sequence, so a prefetch of
+        # "route_steps__waypoint" is used as-is instead of re-querying.
+        if "route_steps" in getattr(self, "_prefetched_objects_cache", {}):
+            stops = [step.waypoint.code for step in self.route_steps.all()]
+        else:
+            # Without a prefetch, read just the codes in one query
+            stops = list(self.route_steps.values_list("waypoint__code", flat=True))
 
         # 2. Join them: "KBFI -> KRNT -> KBFI"
-        path_string = " -> ".join(stops) if stops else "No waypoints assigned"
+        return " -> ".join(stops) if stops else "No waypoints assigned"
 
-        # 3. Return the name + the path
-        return f"{self.name}: ({path_string})"
+    def __str__(self):
+        # Return the name + the path
+        return f"{self.name}: ({self.path})"
 
 
 class RouteWaypoint(models.Model):
@@ -44,4 +49,6 @@ class RouteWaypoint(models.Model):
 
     class Meta:
         ordering = ["sequence"]
-        unique_together = [["route", "sequence"]]
+        constraints = [
+            models.UniqueConstraint(fields=["route", "sequence"], name="routewaypoint_route_sequence_unique"),
+        ]